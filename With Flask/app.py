@@ -1,6 +1,13 @@
-from flask import Flask, render_template, request, redirect, url_for, flash
+from flask import Flask, stream_template, request, redirect, url_for, flash, abort, g, has_request_context, get_flashed_messages
 from flask_sqlalchemy import SQLAlchemy
+from flask_caching import Cache
+import click
+from sqlalchemy import case, delete, event, func, insert, select, update
+from sqlalchemy.orm import raiseload
 from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+import csv
+import io
 import os
 
 app = Flask(__name__)
@@ -12,9 +19,32 @@ DB_PATH = os.path.join(BASE_DIR, 'expenses.db')
 
 app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{DB_PATH}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Pool sized for a threaded WSGI server (e.g. gunicorn -k gthread --threads 8);
+# connections may be handed between threads, so SQLite's thread check is disabled
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_pre_ping': True,
+    'connect_args': {'check_same_thread': False}
+}
+# Cap request bodies so a CSV upload to /import can't exhaust memory;
+# the expense forms are far smaller than this
+app.config['MAX_CONTENT_LENGTH'] = 1024 * 1024
+
+# Expense validation rules
+VALID_CATEGORIES = frozenset({
+    'Food', 'Transport', 'Utilities', 'Entertainment', 'Healthcare', 'Shopping', 'Other'
+})
+MAX_AMOUNT = Decimal('1000000')
+CENT = Decimal('0.01')
+DATE_FORMAT = '%Y-%m-%d'
 
 db = SQLAlchemy(app)
 
+# Cache for aggregate endpoints, cleared whenever expenses change.
+# SimpleCache lives in process memory, so run a single worker process.
+cache = Cache(app, config={'CACHE_TYPE': 'SimpleCache', 'CACHE_DEFAULT_TIMEOUT': 300})
+
 # =========================
 # Database Model
 # =========================
@@ -23,125 +53,287 @@ class Expense(db.Model):
     __tablename__ = 'expenses'
 
     id = db.Column(db.Integer, primary_key=True)
-    amount = db.Column(db.Float, nullable=False)
+    amount = db.Column(db.Integer, nullable=False)  # stored in cents
     category = db.Column(db.String(50), nullable=False)
-    date = db.Column(db.String(10), nullable=False)
+    date = db.Column(db.Date, nullable=False)
     description = db.Column(db.String(255), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+    # Descending index so date range filters and ORDER BY date DESC
+    # can both be served from the index instead of a scan + sort
+    __table_args__ = (
+        db.Index('ix_expenses_date', date.desc()),
+    )
+
     def to_dict(self):
         """Convert expense object to dictionary"""
+        return Expense.row_to_dict(self)
+
+    @staticmethod
+    def row_to_dict(row):
+        """Convert an expense object or a result row with the same columns to dictionary"""
         return {
-            'id': self.id,
-            'amount': self.amount,
-            'category': self.category,
-            'date': self.date,
-            'description': self.description,
-            'created_at': self.created_at.strftime('%Y-%m-%d %H:%M:%S') if self.created_at else None
+            'id': row.id,
+            'amount': row.amount / 100,
+            'category': row.category,
+            'date': row.date.isoformat(),
+            'description': row.description,
+            'created_at': row.created_at.isoformat(sep=' ', timespec='seconds') if row.created_at else None
         }
 
 # =========================
 # Initialize Database
 # =========================
+def _set_sqlite_pragmas(dbapi_conn, connection_record):
+    """Use WAL journaling so commits need fewer fsyncs and readers don't block writers"""
+    cursor = dbapi_conn.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=134217728')
+    cursor.close()
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    """Count SQL statements per request so N+1 patterns show up in the logs"""
+    if has_request_context():
+        g._query_count = g.get('_query_count', 0) + 1
+
+
 with app.app_context():
+    event.listen(db.engine, 'connect', _set_sqlite_pragmas)
+    event.listen(db.engine, 'before_cursor_execute', _count_query)
     db.create_all()
+    # create_all() does not touch existing tables, so add the index to older databases
+    db.session.execute(db.text(
+        'CREATE INDEX IF NOT EXISTS ix_expenses_date ON expenses (date DESC)'
+    ))
+
+    # Databases created before amounts were stored in cents still hold
+    # dollar values; convert them once and record it in user_version
+    if db.session.execute(db.text('PRAGMA user_version')).scalar() < 1:
+        columns = db.session.execute(db.text('PRAGMA table_info(expenses)')).all()
+        if any(col[1] == 'amount' and col[2] != 'INTEGER' for col in columns):
+            db.session.execute(db.text(
+                'UPDATE expenses SET amount = CAST(ROUND(amount * 100) AS INTEGER)'
+            ))
+        db.session.execute(db.text('PRAGMA user_version = 1'))
+    db.session.commit()
     print(f"✓ Database initialized at: {DB_PATH}")
 
 # =========================
 # Helper Functions
 # =========================
-def get_filtered_expenses(filter_type='all'):
+def _now():
     """
-    Get expenses filtered by time period
+    Current time, taken once per request
+    
+    Returns:
+        datetime: The same instant for every caller within a request
+    """
+    if not has_request_context():
+        return datetime.now()
+    if not hasattr(g, '_now'):
+        g._now = datetime.now()
+    return g._now
+
+
+def get_date_filters(filter_type='all'):
+    """
+    Build the date filter expressions for a time period
     
     Args:
         filter_type (str): 'all', 'week', or 'month'
     
     Returns:
-        list: List of expense dictionaries
+        list: SQLAlchemy filter expressions on Expense.date
     """
-    query = Expense.query
-
+    # Both filters use explicit [start, end) bounds so SQLite can do a
+    # bounded range scan on ix_expenses_date
     if filter_type == 'week':
-        week_ago = (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')
-        query = query.filter(Expense.date >= week_ago)
+        today = _now().date()
+        week_ago = today - timedelta(days=7)
+        tomorrow = today + timedelta(days=1)
+        return [Expense.date >= week_ago, Expense.date < tomorrow]
 
-    elif filter_type == 'month':
-        current_month = datetime.now().strftime('%Y-%m')
-        query = query.filter(Expense.date.like(f'{current_month}%'))
+    if filter_type == 'month':
+        today = _now().date()
+        start = today.replace(day=1)
+        next_month = (today.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return [Expense.date >= start, Expense.date < next_month]
 
-    expenses = query.order_by(Expense.date.desc()).all()
-    return [exp.to_dict() for exp in expenses]
+    return []
 
 
-def get_custom_range_expenses(start_date, end_date):
+def get_custom_range_filters(start_date, end_date):
     """
-    Get expenses filtered by custom date range
+    Build the date filter expressions for a custom date range
     
     Args:
         start_date (str): Start date in YYYY-MM-DD format
         end_date (str): End date in YYYY-MM-DD format
     
     Returns:
-        list: List of expense dictionaries
+        list: SQLAlchemy filter expressions on Expense.date
     """
     try:
-        # Validate dates
-        datetime.strptime(start_date, '%Y-%m-%d')
-        datetime.strptime(end_date, '%Y-%m-%d')
-        
-        # Query expenses within date range
-        query = Expense.query.filter(
-            Expense.date >= start_date,
-            Expense.date <= end_date
-        )
-        
-        expenses = query.order_by(Expense.date.desc()).all()
-        return [exp.to_dict() for exp in expenses]
-    
+        start = datetime.strptime(start_date, DATE_FORMAT).date()
+        end = datetime.strptime(end_date, DATE_FORMAT).date()
     except ValueError:
-        # Invalid date format, return empty list
-        return []
+        # Invalid date format, match nothing
+        return [db.false()]
 
+    return [Expense.date >= start, Expense.date <= end]
 
-def get_summary(expenses):
+
+def expenses_select(range_filters):
     """
-    Calculate summary statistics for expenses
+    Build the query for an expense list, newest first
     
     Args:
-        expenses (list): List of expense dictionaries
+        range_filters (list): Filter expressions from get_date_filters()
+            or get_custom_range_filters()
     
     Returns:
-        dict: Summary statistics including total, count, categories, and breakdown
+        Select: Statement selecting the expense columns
     """
-    if not expenses:
-        return {
-            'total': 0.0,
-            'count': 0,
-            'categories': 0,
-            'category_breakdown': {}
-        }
+    # Plain column rows, no ORM instances to build for a read-only list
+    return (
+        select(
+            Expense.id, Expense.amount, Expense.category, Expense.date,
+            Expense.description, Expense.created_at
+        )
+        .where(*range_filters)
+        .order_by(Expense.date.desc())
+    )
+
+
+def explain_query_plan(stmt):
+    """
+    Ask SQLite how it would execute a statement
+    
+    Args:
+        stmt (Select): Statement to explain
+    
+    Returns:
+        list: Detail strings from EXPLAIN QUERY PLAN
+    """
+    sql = str(stmt.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    plan = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {sql}')).all()
+    return [row[3] for row in plan]
+
 
-    total = sum(float(exp['amount']) for exp in expenses)
-    categories = set(exp['category'] for exp in expenses)
+def iter_expenses(range_filters, batch_size=500):
+    """
+    Lazily yield expenses matching the given filters, newest first
+    
+    Args:
+        range_filters (list): Filter expressions from get_date_filters()
+            or get_custom_range_filters()
+        batch_size (int): Rows fetched from the cursor at a time
+    
+    Yields:
+        dict: Expense dictionaries
+    """
+    stmt = expenses_select(range_filters).execution_options(yield_per=batch_size)
+    for row in db.session.execute(stmt):
+        yield Expense.row_to_dict(row)
 
-    # Calculate category-wise totals
-    category_totals = {}
-    for exp in expenses:
-        cat = exp['category']
-        category_totals[cat] = category_totals.get(cat, 0) + float(exp['amount'])
 
-    # Sort categories by amount (highest first)
-    category_totals = dict(sorted(category_totals.items(), key=lambda x: x[1], reverse=True))
+def get_summary_sql(range_filters):
+    """
+    Calculate summary statistics for expenses in the database
+    
+    Args:
+        range_filters (list): Filter expressions from get_date_filters()
+            or get_custom_range_filters()
+    
+    Returns:
+        dict: Summary statistics including total, count, categories, and breakdown
+    """
+    total, count = db.session.query(
+        func.coalesce(func.sum(Expense.amount), 0),
+        func.count(Expense.id)
+    ).filter(*range_filters).one()
+
+    # Category-wise totals, sorted by amount (highest first)
+    category_totals = dict(
+        db.session.query(Expense.category, func.sum(Expense.amount))
+        .filter(*range_filters)
+        .group_by(Expense.category)
+        .order_by(func.sum(Expense.amount).desc())
+        .all()
+    )
 
     return {
-        'total': round(total, 2),
-        'count': len(expenses),
-        'categories': len(categories),
-        'category_breakdown': category_totals
+        'total': round(total / 100, 2),
+        'count': count,
+        'categories': len(category_totals),
+        'category_breakdown': {cat: cents / 100 for cat, cents in category_totals.items()}
     }
 
 
+def get_daily_totals_sql(range_filters):
+    """
+    Calculate the total spent per day
+    
+    Args:
+        range_filters (list): Filter expressions from get_date_filters()
+            or get_custom_range_filters()
+    
+    Returns:
+        dict: Daily totals keyed by date string, oldest first
+    """
+    rows = (
+        db.session.query(Expense.date, func.sum(Expense.amount))
+        .filter(*range_filters)
+        .group_by(Expense.date)
+        .order_by(Expense.date)
+        .all()
+    )
+    return {day.isoformat(): cents / 100 for day, cents in rows}
+
+
+def get_period_summaries_sql(filter_types):
+    """
+    Calculate summary statistics for several time periods in one query
+    
+    Args:
+        filter_types (list): Periods accepted by get_date_filters()
+    
+    Returns:
+        dict: Summary statistics for each period, keyed by filter type
+    """
+    # One conditional SUM per period over a single GROUP BY category pass,
+    # instead of one scan per period
+    columns = [Expense.category]
+    for filter_type in filter_types:
+        range_filters = get_date_filters(filter_type)
+        condition = db.and_(*range_filters) if range_filters else db.true()
+        columns.append(func.sum(case((condition, Expense.amount), else_=0)))
+        columns.append(func.sum(case((condition, 1), else_=0)))
+
+    rows = db.session.query(*columns).group_by(Expense.category).all()
+
+    summaries = {}
+    for i, filter_type in enumerate(filter_types):
+        amount_col, count_col = 1 + 2 * i, 2 + 2 * i
+        category_totals = {
+            row[0]: row[amount_col] for row in rows if row[count_col]
+        }
+        # Sort categories by amount (highest first)
+        category_totals = dict(sorted(category_totals.items(), key=lambda x: x[1], reverse=True))
+
+        summaries[filter_type] = {
+            'total': round(sum(category_totals.values()) / 100, 2),
+            'count': sum(row[count_col] for row in rows),
+            'categories': len(category_totals),
+            'category_breakdown': {cat: cents / 100 for cat, cents in category_totals.items()}
+        }
+
+    return summaries
+
+
 def validate_expense_data(amount, category, date, description):
     """
     Validate expense input data
@@ -153,41 +345,49 @@ def validate_expense_data(amount, category, date, description):
         description (str): Description text
     
     Returns:
-        tuple: (is_valid, error_message)
+        tuple: (is_valid, error_message, amount_cents) where amount_cents
+            is the amount rounded half-up to whole cents when valid,
+            otherwise None
     """
     # Check if all fields are provided
     if not all([amount, category, date, description]):
-        return False, "All fields are required!"
+        return False, "All fields are required!", None
 
     # Validate amount
     try:
-        amount_float = float(amount)
-        if amount_float <= 0:
-            return False, "Amount must be greater than 0!"
-        if amount_float > 1000000:
-            return False, "Amount is too large!"
-    except ValueError:
-        return False, "Invalid amount format!"
+        amount_decimal = Decimal(amount)
+    except InvalidOperation:
+        return False, "Invalid amount format!", None
+    if not amount_decimal.is_finite():
+        return False, "Invalid amount format!", None
+    if amount_decimal <= 0:
+        return False, "Amount must be greater than 0!", None
+    if amount_decimal > MAX_AMOUNT:
+        return False, "Amount is too large!", None
+
+    # Round in decimal so inputs like 12.345 don't pick up binary float error
+    amount_cents = int(amount_decimal.quantize(CENT, ROUND_HALF_UP) * 100)
+    if amount_cents < 1:
+        return False, "Amount must be at least $0.01!", None
 
     # Validate date format
     try:
-        datetime.strptime(date, '%Y-%m-%d')
+        datetime.strptime(date, DATE_FORMAT)
     except ValueError:
-        return False, "Invalid date format!"
+        return False, "Invalid date format!", None
 
     # Validate description length
     if len(description) > 255:
-        return False, "Description is too long (max 255 characters)!"
+        return False, "Description is too long (max 255 characters)!", None
 
     if len(description.strip()) == 0:
-        return False, "Description cannot be empty!"
+        return False, "Description cannot be empty!", None
 
     # Validate category
-    valid_categories = ['Food', 'Transport', 'Utilities', 'Entertainment', 'Healthcare', 'Shopping', 'Other']
-    if category not in valid_categories:
-        return False, "Invalid category!"
+    if category not in VALID_CATEGORIES:
+        return False, "Invalid category!", None
 
-    return True, None
+    return True, None, amount_cents
 
 
 # =========================
@@ -195,8 +395,35 @@ def validate_expense_data(amount, category, date, description):
 # =========================
 @app.context_processor
 def inject_today():
-    """Inject today's date into all templates"""
-    return {'today': datetime.now().strftime('%Y-%m-%d')}
+    """Inject today's date into all templates, formatted once per request"""
+    if not hasattr(g, '_today'):
+        g._today = _now().strftime(DATE_FORMAT)
+    return {'today': g._today}
+
+
+# =========================
+# Template Filters
+# =========================
+@app.template_filter('currency')
+def format_currency(value):
+    """Format a dollar amount for display"""
+    return f'${value:.2f}'
+
+
+# =========================
+# Request Hooks
+# =========================
+@app.after_request
+def log_query_count(response):
+    """Log how many SQL statements the request ran, once the response is closed"""
+    # teardown_request fires twice for streamed pages, and only the second
+    # time after the list query; closing the response happens exactly once
+    request_g = g._get_current_object()
+    method, path = request.method, request.path
+    response.call_on_close(lambda: app.logger.debug(
+        '%s %s: %d queries', method, path, request_g.get('_query_count', 0)
+    ))
+    return response
 
 
 # =========================
@@ -213,21 +440,39 @@ def index():
     if filter_type not in ['all', 'week', 'month', 'custom']:
         filter_type = 'all'
     
-    # Get filtered expenses
+    # Get filters for the selected period
     if filter_type == 'custom' and start_date and end_date:
-        expenses = get_custom_range_expenses(start_date, end_date)
+        range_filters = get_custom_range_filters(start_date, end_date)
     else:
-        expenses = get_filtered_expenses(filter_type)
+        range_filters = get_date_filters(filter_type)
     
-    summary = get_summary(expenses)
-
-    return render_template(
+    summary = get_summary_sql(range_filters)
+    daily_totals = get_daily_totals_sql(range_filters)
+
+    # Expense being edited
+    editing = None
+    edit_id = request.args.get('edit', type=int)
+    if edit_id is not None:
+        # raiseload('*') makes any future lazy-loaded relationship fail loudly
+        expense = db.session.get(Expense, edit_id, options=[raiseload('*')])
+        if expense is None:
+            abort(404)
+        editing = expense.to_dict()
+
+    # Pop flashes before streaming starts; the session cookie is saved
+    # before the template body runs, so a pop inside it would be lost
+    get_flashed_messages(with_categories=True)
+
+    # Stream the page so rows are rendered as they come off the cursor
+    return stream_template(
         'index.html',
-        expenses=expenses,
+        expenses=iter_expenses(range_filters),
         summary=summary,
+        daily_totals=daily_totals,
         current_filter=filter_type,
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        editing=editing
     )
 
 
@@ -240,21 +485,22 @@ def add_expense():
     description = request.form.get('description')
 
     # Validate input
-    is_valid, error_message = validate_expense_data(amount, category, date, description)
+    is_valid, error_message, amount_cents = validate_expense_data(amount, category, date, description)
     if not is_valid:
         flash(error_message, 'error')
         return redirect(url_for('index'))
 
     try:
         expense = Expense(
-            amount=float(amount),
+            amount=amount_cents,
             category=category,
-            date=date,
+            date=datetime.strptime(date, DATE_FORMAT).date(),
             description=description.strip()
         )
         db.session.add(expense)
         db.session.commit()
-        flash(f'💰 Expense of ${float(amount):.2f} added successfully!', 'success')
+        cache.clear()
+        flash({'kind': 'added', 'amount': amount_cents / 100}, 'success')
     except Exception as e:
         db.session.rollback()
         flash(f'❌ Error adding expense: {str(e)}', 'error')
@@ -263,25 +509,56 @@ def add_expense():
     return redirect(url_for('index'))
 
 
+@app.route('/import', methods=['POST'])
+def import_expenses():
+    """Import expenses from an uploaded CSV file"""
+    file = request.files.get('file')
+    if not file or not file.filename:
+        flash('Please choose a CSV file to import!', 'error')
+        return redirect(url_for('index'))
+
+    try:
+        # Expected header: amount,category,date,description
+        reader = csv.DictReader(io.StringIO(file.stream.read().decode('utf-8-sig')))
+        rows = []
+        skipped = 0
+        for line in reader:
+            amount, category, date, description = (
+                (line.get(field) or '').strip()
+                for field in ('amount', 'category', 'date', 'description')
+            )
+            # The validator also converts the amount, so a row that passes it
+            # can't fail later and roll back the rest of the file
+            is_valid, error_message, amount_cents = validate_expense_data(amount, category, date, description)
+            if not is_valid:
+                skipped += 1
+                continue
+            rows.append({
+                'amount': amount_cents,
+                'category': category,
+                'date': datetime.strptime(date, DATE_FORMAT).date(),
+                'description': description
+            })
+
+        # One executemany INSERT in a single transaction for the whole file
+        if rows:
+            db.session.execute(insert(Expense), rows)
+            db.session.commit()
+            cache.clear()
+        flash({'kind': 'imported', 'count': len(rows), 'skipped': skipped}, 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'❌ Error importing expenses: {str(e)}', 'error')
+        print(f"Error importing expenses: {e}")
+
+    return redirect(url_for('index'))
+
+
 @app.route('/edit/<int:id>')
 def edit_expense(id):
     """Display edit form for an expense"""
-    expense = Expense.query.get_or_404(id)
-
     filter_type = request.args.get('filter', 'all')
-    if filter_type not in ['all', 'week', 'month', 'custom']:
-        filter_type = 'all'
-    
-    expenses = get_filtered_expenses(filter_type)
-    summary = get_summary(expenses)
-
-    return render_template(
-        'index.html',
-        expenses=expenses,
-        summary=summary,
-        current_filter=filter_type,
-        editing=expense.to_dict()
-    )
+    return redirect(url_for('index', filter=filter_type, edit=id))
 
 
 @app.route('/update/<int:id>', methods=['POST'])
@@ -293,19 +570,28 @@ def update_expense(id):
     description = request.form.get('description')
 
     # Validate input
-    is_valid, error_message = validate_expense_data(amount, category, date, description)
+    is_valid, error_message, amount_cents = validate_expense_data(amount, category, date, description)
     if not is_valid:
         flash(error_message, 'error')
         return redirect(url_for('edit_expense', id=id))
 
     try:
-        expense = Expense.query.get_or_404(id)
-        expense.amount = float(amount)
-        expense.category = category
-        expense.date = date
-        expense.description = description.strip()
+        # Single UPDATE by primary key, no SELECT first
+        result = db.session.execute(
+            update(Expense)
+            .where(Expense.id == id)
+            .values(
+                amount=amount_cents,
+                category=category,
+                date=datetime.strptime(date, DATE_FORMAT).date(),
+                description=description.strip()
+            )
+        )
+        if result.rowcount == 0:
+            abort(404)
 
         db.session.commit()
+        cache.clear()
         flash(f'✓ Expense updated successfully!', 'success')
     except Exception as e:
         db.session.rollback()
@@ -319,11 +605,16 @@ def update_expense(id):
 def delete_expense(id):
     """Delete an expense"""
     try:
-        expense = Expense.query.get_or_404(id)
-        amount = expense.amount
-        db.session.delete(expense)
+        # Single DELETE by primary key, returning the amount for the message
+        amount_cents = db.session.execute(
+            delete(Expense).where(Expense.id == id).returning(Expense.amount)
+        ).scalar()
+        if amount_cents is None:
+            abort(404)
+        amount = amount_cents / 100
         db.session.commit()
-        flash(f'🗑️ Expense of ${amount:.2f} deleted successfully!', 'success')
+        cache.clear()
+        flash({'kind': 'deleted', 'amount': amount}, 'success')
     except Exception as e:
         db.session.rollback()
         flash(f'❌ Error deleting expense: {str(e)}', 'error')
@@ -332,17 +623,21 @@ def delete_expense(id):
     return redirect(url_for('index'))
 
 
+def stats_cache_key():
+    """Cache key for /stats, bucketed by day so week/month windows roll over"""
+    return f"stats:{_now():%Y-%m-%d}"
+
+
 @app.route('/stats')
+@cache.cached(key_prefix=stats_cache_key)
 def stats():
     """Display statistics page (optional - for future enhancement)"""
-    all_expenses = get_filtered_expenses('all')
-    month_expenses = get_filtered_expenses('month')
-    week_expenses = get_filtered_expenses('week')
-    
+    summaries = get_period_summaries_sql(['all', 'month', 'week'])
+
     return {
-        'all_time': get_summary(all_expenses),
-        'this_month': get_summary(month_expenses),
-        'this_week': get_summary(week_expenses)
+        'all_time': summaries['all'],
+        'this_month': summaries['month'],
+        'this_week': summaries['week']
     }
 
 
@@ -356,6 +651,13 @@ def not_found(error):
     return redirect(url_for('index'))
 
 
+@app.errorhandler(413)
+def request_too_large(error):
+    """Handle uploads over MAX_CONTENT_LENGTH"""
+    flash('⚠️ File is too large (max 1 MB)!', 'error')
+    return redirect(url_for('index'))
+
+
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
@@ -364,11 +666,62 @@ def internal_error(error):
     return redirect(url_for('index'))
 
 
+# =========================
+# CLI Commands
+# =========================
+def searches_date_index(plan):
+    """
+    Check whether a query plan does a bounded search on ix_expenses_date
+    
+    Args:
+        plan (list): Detail strings from explain_query_plan()
+    
+    Returns:
+        bool: True if SQLite seeks into the index rather than scanning it
+    """
+    # ORDER BY date DESC alone gives "SCAN ... USING INDEX", so only a
+    # SEARCH shows that the date filter itself is sargable
+    return any(
+        detail.startswith('SEARCH') and 'INDEX ix_expenses_date' in detail
+        for detail in plan
+    )
+
+
+@app.cli.command('check-query-plans')
+def check_query_plans():
+    """Fail if the date-filtered list queries stop using ix_expenses_date"""
+    today = _now().strftime(DATE_FORMAT)
+
+    # Sanity check: a non-sargable filter must be reported as a scan,
+    # otherwise the check below could never fail
+    control = [func.strftime('%Y-%m', Expense.date) == today[:7]]
+    if searches_date_index(explain_query_plan(expenses_select(control))):
+        raise click.ClickException("Query plan check cannot tell a search from a scan")
+
+    cases = {
+        'week': get_date_filters('week'),
+        'month': get_date_filters('month'),
+        'custom': get_custom_range_filters(today, today),
+    }
+
+    failed = []
+    for name, range_filters in cases.items():
+        plan = explain_query_plan(expenses_select(range_filters))
+        uses_index = searches_date_index(plan)
+        click.echo(f"{'✓' if uses_index else '✗'} {name}: {'; '.join(plan)}")
+        if not uses_index:
+            failed.append(name)
+
+    if failed:
+        raise click.ClickException(f"No index search for: {', '.join(failed)}")
+
+
 # =========================
 # Run App
 # =========================
 if __name__ == '__main__':
     port = 3200
+    debug = os.environ.get('FLASK_DEBUG') == '1'
     print("=" * 60)
     print("💰 Personal Expense Tracker - Enhanced Edition")
     print("=" * 60)
@@ -376,7 +729,14 @@ if __name__ == '__main__':
     print(f"📁 Database: {DB_PATH}")
     print(f"🌐 Open your browser at: http://localhost:{port}")
     print("=" * 60)
+    if not debug:
+        print("⚙️  For production, run behind a WSGI server:")
+        # One worker: the /stats SimpleCache is per process, so more workers
+        # would keep serving stale stats after another worker's writes
+        print(f"   gunicorn -w 1 -k gthread --threads 8 -b 0.0.0.0:{port} app:app")
+        print("🐞 Set FLASK_DEBUG=1 for the debugger and auto-reloader")
+        print("=" * 60)
     print("Press CTRL+C to quit")
     print("=" * 60)
 
-    app.run(debug=True, host='0.0.0.0', port=port)
+    app.run(debug=debug, host='0.0.0.0', port=port, threaded=True)